@@ -0,0 +1,65 @@
+"""
+Measures how long ``import extendy`` takes in fresh interpreters, and lists
+the potentially expensive modules that it pulls in.
+
+    python benchmark/import_time.py [--runs N]
+"""
+
+import json
+import subprocess
+import sys
+
+from argparse import ArgumentParser
+
+
+SCRIPT = '''
+import json, sys, time
+before = set(sys.modules)
+start = time.time()
+import extendy
+elapsed = time.time() - start
+json.dump({
+    'time': elapsed,
+    'modules': sorted(set(sys.modules) - before),
+}, sys.stdout)
+'''
+
+WATCHED = (
+    'pkg_resources',
+    'pkgutil',
+    'six',
+    'zipfile',
+    'mmap',
+    'multiprocessing',
+    'tracemalloc',
+)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    results = [
+        json.loads(subprocess.check_output([sys.executable, '-c', SCRIPT]))
+        for _ in range(args.runs)
+    ]
+    times = sorted(result['time'] for result in results)
+    modules = results[-1]['modules']
+
+    print('import extendy: min %.1f ms, median %.1f ms, max %.1f ms' % (
+        times[0] * 1000,
+        times[len(times) // 2] * 1000,
+        times[-1] * 1000,
+    ))
+    print('modules imported: %d' % (len(modules),))
+    for name in WATCHED:
+        print('  %-16s %s' % (
+            name,
+            'imported' if name in modules else 'not imported',
+        ))
+
+
+if __name__ == '__main__':
+    main()
+
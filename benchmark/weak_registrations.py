@@ -0,0 +1,85 @@
+"""
+Registers, dispatches to, and then drops batches of dynamically generated
+implementation classes, printing the resident memory of the process after
+each batch.
+
+With weak registrations the RSS stays flat; run with ``--strong`` to compare
+against the default behavior, where it grows with every batch.
+
+    python benchmark/weak_registrations.py [--strong] [--total N] [--batch N]
+"""
+
+import gc
+import os
+import resource
+import sys
+import time
+
+from argparse import ArgumentParser
+
+from extendy import Extension, Manager
+
+
+class TenantExtension(Extension):
+    def handle(self, request):
+        pass
+
+
+def get_rss():
+    try:
+        with open('/proc/self/statm', 'r') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize()
+    except (IOError, OSError):
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def generate(index):
+    settings = {'tenant': index, 'payload': 'x' * 256}
+
+    def handle(self, request):
+        return settings['tenant'], request
+
+    return type(
+        'Tenant%dImplementation' % (index,),
+        (TenantExtension,),
+        {'handle': handle, '__module__': 'tenant_%d' % (index,)},
+    )
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('--strong', action='store_true')
+    parser.add_argument('--total', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+
+    manager = Manager(weak_registrations=not args.strong)
+
+    print('%10s  %10s  %12s  %10s' % (
+        'Classes',
+        'Registered',
+        'RSS (MiB)',
+        'Batch (s)',
+    ))
+    for start in range(0, args.total, args.batch):
+        began = time.time()
+        for index in range(start, min(start + args.batch, args.total)):
+            manager.register(TenantExtension, generate(index))
+            manager.dispatch(TenantExtension, 'handle', (index,))
+        gc.collect()
+        end = min(start + args.batch, args.total)
+        if end % (args.batch * 10) and end != args.total:
+            continue
+        print('%10d  %10d  %12.1f  %10.3f' % (
+            end,
+            len(manager.find_by_registration(TenantExtension)),
+            get_rss() / (1024.0 * 1024.0),
+            time.time() - began,
+        ))
+
+
+if __name__ == '__main__':
+    main()
+
@@ -3,7 +3,17 @@ from abc import abstractmethod, abstractproperty
 
 from .error import ExtendyError, ExtendyWarning
 from .extension import Extension
+from .filter import EntryPointFilter
 from .manager import Manager, GlobalManager
+from .source import (
+    Source,
+    RegistrationSource,
+    EntryPointSource,
+    PathSource,
+    ModuleSource,
+    ModulePrefixSource,
+    NameSource,
+)
 
 
 __all__ = (
@@ -12,6 +22,16 @@ __all__ = (
     'Manager',
     'GlobalManager',
 
+    'EntryPointFilter',
+
+    'Source',
+    'RegistrationSource',
+    'EntryPointSource',
+    'PathSource',
+    'ModuleSource',
+    'ModulePrefixSource',
+    'NameSource',
+
     'ExtendyError',
     'ExtendyWarning',
 
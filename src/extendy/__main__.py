@@ -0,0 +1,31 @@
+
+import sys
+
+from argparse import ArgumentParser
+
+from . import profiler
+from .error import ExtendyError
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog='extendy')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    profiler.configure_parser(commands.add_parser(
+        'profile',
+        help='measure the import cost of the implementations of an'
+        ' Extension (requires Python 3.4 or later)',
+    ))
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except ExtendyError as exc:
+        sys.stderr.write('%s\n' % (exc,))
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
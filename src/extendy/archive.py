@@ -0,0 +1,180 @@
+
+import mmap
+import os
+import re
+import sys
+import zipfile
+
+from types import ModuleType
+
+try:
+    from importlib.machinery import ModuleSpec
+except ImportError:  # pragma: no cover
+    ModuleSpec = None
+
+
+RE_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class MappedFile(mmap.mmap):
+    """
+    A read-only memory map that ``zipfile`` can use as a file object.
+    """
+
+    def seekable(self):  # noqa: no-self-use
+        return True
+
+
+class Archive(object):
+    """
+    A zip or wheel archive of modules that is opened once and kept open, so
+    that its central directory is only read once and modules can be loaded
+    from it without reopening the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.stat = os.stat(path)
+        self._file = open(path, 'rb')
+        try:
+            self._buffer = MappedFile(
+                self._file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+        except (ValueError, EnvironmentError):
+            self._buffer = None
+        else:
+            self._file.close()
+        try:
+            self._zip = zipfile.ZipFile(
+                self._file if self._buffer is None else self._buffer,
+            )
+        except Exception:
+            self.close()
+            raise
+        self.modules = self._index()
+
+    def _index(self):
+        modules = {}
+
+        for member in self._zip.namelist():
+            parts = member.split('/')
+            if len(parts) == 1 and member.endswith('.py'):
+                name, is_package = member[:-3], False
+            elif len(parts) == 2 and parts[1] == '__init__.py':
+                name, is_package = parts[0], True
+            else:
+                continue
+            if RE_IDENTIFIER.match(name):
+                if is_package or name not in modules:
+                    modules[name] = (member, is_package)
+
+        return modules
+
+    def is_stale(self):
+        """
+        Returns whether or not the archive file has changed since it was
+        opened.
+
+        :rtype: bool
+        """
+
+        try:
+            current = os.stat(self.path)
+        except EnvironmentError:
+            return True
+        return (current.st_mtime, current.st_size) != (
+            self.stat.st_mtime,
+            self.stat.st_size,
+        )
+
+    def iter_modules(self):
+        """
+        Returns the names of the top-level modules and packages in the
+        archive.
+
+        :rtype: list(str)
+        """
+
+        return sorted(self.modules)
+
+    def is_package(self, fullname):
+        return self.modules[fullname][1]
+
+    def get_source(self, fullname):
+        source = self._zip.read(self.modules[fullname][0])
+        return source.decode('utf-8')
+
+    def create_module(self, spec):  # noqa: no-self-use
+        return None
+
+    def exec_module(self, module):
+        """
+        Executes the code of a top-level module or package from the archive in
+        the namespace of the specified module.
+
+        :param module: the module to execute
+        :type module: module
+        """
+
+        member = self.modules[module.__name__][0]
+        code = compile(
+            self._zip.read(member),
+            os.path.join(self.path, member),
+            'exec',
+            dont_inherit=True,
+        )
+        exec(code, module.__dict__)  # noqa: exec-used
+
+    def load_module(self, fullname):
+        """
+        Imports the specified top-level module or package from the archive.
+
+        :param fullname: the name of the module
+        :type fullname: str
+        :rtype: module
+        """
+
+        member, is_package = self.modules[fullname]
+        filename = os.path.join(self.path, member)
+
+        module = ModuleType(fullname)
+        module.__file__ = filename
+        module.__loader__ = self
+        if is_package:
+            module.__path__ = [os.path.join(self.path, fullname)]
+            module.__package__ = fullname
+        else:
+            module.__package__ = ''
+        if ModuleSpec is not None:
+            module.__spec__ = ModuleSpec(
+                fullname,
+                self,
+                origin=filename,
+                is_package=is_package,
+            )
+            module.__spec__.has_location = True
+            if is_package:
+                module.__spec__.submodule_search_locations = module.__path__
+
+        sys.modules[fullname] = module
+        try:
+            self.exec_module(module)
+        except BaseException:
+            sys.modules.pop(fullname, None)
+            raise
+
+        return sys.modules[fullname]
+
+    def close(self):
+        """
+        Closes the archive file.
+        """
+
+        if getattr(self, '_zip', None) is not None:
+            self._zip.close()
+        if self._buffer is not None:
+            self._buffer.close()
+        self._file.close()
+
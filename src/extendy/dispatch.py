@@ -0,0 +1,84 @@
+
+from .error import ExtendyError
+
+
+#: Calls every implementation in turn and discards the results.
+SEQUENTIAL = 'sequential'
+
+#: Calls implementations in turn until one returns something other than
+#: ``None``, and returns that value.
+FIRST = 'first'
+
+#: Calls every implementation in turn and returns a list of the results.
+COLLECT = 'collect'
+
+#: Calls every implementation concurrently on the Manager's thread pool and
+#: returns a list of the results.
+THREADED = 'threaded'
+
+MODES = (
+    SEQUENTIAL,
+    FIRST,
+    COLLECT,
+    THREADED,
+)
+
+
+class DispatchPlan(object):
+    """
+    A precompiled list of bound methods that a Manager invokes when
+    dispatching a call to the implementations of an Extension.
+    """
+
+    def __init__(self, callables):
+        self.callables = tuple(callables)
+
+    def __len__(self):
+        return len(self.callables)
+
+    def __call__(self, args, kwargs, mode=SEQUENTIAL, pool=None):
+        """
+        Invokes the callables in this plan.
+
+        :param args: the positional arguments to pass to each callable
+        :type args: tuple
+        :param kwargs: the keyword arguments to pass to each callable
+        :type kwargs: dict
+        :param mode:
+            how to invoke the callables; one of ``sequential``, ``first``,
+            ``collect``, or ``threaded``
+        :type mode: str
+        :param pool:
+            the thread pool to use when ``mode`` is ``threaded``
+        :type pool: multiprocessing.pool.ThreadPool
+        """
+
+        if mode == SEQUENTIAL:
+            for func in self.callables:
+                func(*args, **kwargs)
+            return None
+
+        if mode == FIRST:
+            for func in self.callables:
+                result = func(*args, **kwargs)
+                if result is not None:
+                    return result
+            return None
+
+        if mode == COLLECT:
+            return [func(*args, **kwargs) for func in self.callables]
+
+        if mode == THREADED:
+            pending = [
+                pool.apply_async(func, args, kwargs)
+                for func in self.callables
+            ]
+            return [result.get() for result in pending]
+
+        raise ExtendyError(
+            '"%s" is not a valid dispatch mode (expected one of: %s)' % (
+                mode,
+                ', '.join(MODES),
+            ),
+        )
+
@@ -1,11 +1,20 @@
 
 import abc
 
-from six import add_metaclass
-
 from .manager import GlobalManager
 
 
+def add_metaclass(metaclass):
+    # A local equivalent of six.add_metaclass(), so that importing extendy
+    # doesn't have to import six.
+    def wrapper(cls):
+        body = dict(vars(cls))
+        body.pop('__dict__', None)
+        body.pop('__weakref__', None)
+        return metaclass(cls.__name__, cls.__bases__, body)
+    return wrapper
+
+
 @add_metaclass(abc.ABCMeta)
 class Extension(object):
     """
@@ -16,6 +25,14 @@ class Extension(object):
     #: GlobalManager is used.
     manager = GlobalManager
 
+    #: How instances of this implementation are shared by the Manager; one of
+    #: ``singleton``, ``thread``, or ``pool``.
+    instance_scope = 'singleton'
+
+    #: The maximum number of instances the Manager will construct when
+    #: ``instance_scope`` is ``pool``.
+    instance_pool_size = 4
+
     @classmethod
     def register(cls, implementation, manager=None):
         """
@@ -33,3 +50,18 @@ class Extension(object):
         manager = manager or cls.manager
         manager.register(cls, implementation)
 
+    @classmethod
+    def dispatch(cls, method, *args, **kwargs):
+        """
+        Calls the specified method on every implementation registered for this
+        Extension, in turn.
+
+        To collect the results of the calls, or to make them concurrently, use
+        ``extendy.Manager.dispatch()``.
+
+        :param method: the name of the method to call
+        :type method: str
+        """
+
+        cls.manager.dispatch(cls, method, args, kwargs)
+
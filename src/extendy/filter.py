@@ -0,0 +1,94 @@
+
+from .manager import listify
+
+
+def normalize(name):
+    import pkg_resources
+    return pkg_resources.safe_name(name).lower()
+
+
+class EntryPointFilter(object):
+    """
+    Decides whether or not an entry point should be loaded using only its
+    metadata, so that excluded entry points are never imported.
+    """
+
+    def __init__(
+            self,
+            names=None,
+            distributions=None,
+            exclude_distributions=None,
+            requirements=None,
+            extras=None):
+        """
+        :param names:
+            the glob patterns that entry point names must match at least one
+            of
+        :type names: list(str)
+        :param distributions:
+            the names of the distributions that entry points must be provided
+            by
+        :type distributions: list(str)
+        :param exclude_distributions:
+            the names of the distributions whose entry points should not be
+            loaded
+        :type exclude_distributions: list(str)
+        :param requirements:
+            requirement specifiers (e.g., ``"someplugin>=1.2"``) that the
+            distributions named in them must satisfy in order for their entry
+            points to be loaded
+        :type requirements: list(str)
+        :param extras:
+            the extras that entry points must declare at least one of (e.g.,
+            ``name = module:Class [extra]``)
+        :type extras: list(str)
+        """
+
+        self.names = listify(names)
+        self.distributions = set(
+            normalize(name)
+            for name in listify(distributions)
+        )
+        self.exclude_distributions = set(
+            normalize(name)
+            for name in listify(exclude_distributions)
+        )
+        self.extras = set(listify(extras))
+
+        self.requirements = {}
+        if requirements:
+            import pkg_resources
+            for requirement in listify(requirements):
+                requirement = pkg_resources.Requirement.parse(requirement)
+                self.requirements[requirement.key] = requirement
+
+    def __call__(self, entry):
+        """
+        Returns whether or not the specified entry point should be loaded.
+
+        :param entry: the entry point to check
+        :type entry: pkg_resources.EntryPoint
+        :rtype: bool
+        """
+
+        if self.names:
+            from fnmatch import fnmatchcase
+            if not any(
+                    fnmatchcase(entry.name, pattern)
+                    for pattern in self.names):
+                return False
+
+        key = entry.dist.key if entry.dist is not None else None
+        if self.distributions and key not in self.distributions:
+            return False
+        if key in self.exclude_distributions:
+            return False
+        requirement = self.requirements.get(key)
+        if requirement is not None and entry.dist not in requirement:
+            return False
+
+        if self.extras and not self.extras.intersection(entry.extras):
+            return False
+
+        return True
+
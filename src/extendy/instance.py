@@ -0,0 +1,295 @@
+
+import threading
+import weakref
+
+from warnings import warn
+
+from .error import ExtendyError, ExtendyWarning
+
+
+#: One instance of the implementation is shared by all callers.
+SINGLETON = 'singleton'
+
+#: Each thread gets its own instance of the implementation.
+THREAD = 'thread'
+
+#: Callers check instances out of a bounded pool for their exclusive use.
+POOL = 'pool'
+
+SCOPES = (
+    SINGLETON,
+    THREAD,
+    POOL,
+)
+
+
+def close_instance(instance):
+    closer = getattr(instance, 'close', None)
+    if not callable(closer):
+        return
+    try:
+        closer()
+    except Exception as exc:  # noqa: broad-except
+        warn(
+            'Could not close instance of "%s.%s": %s' % (
+                instance.__class__.__module__,
+                instance.__class__.__name__,
+                exc,
+            ),
+            ExtendyWarning,
+        )
+
+
+class Scope(object):
+    """
+    Lazily constructs and holds on to the instances of an implementation.
+    """
+
+    def __init__(self, implementation):
+        self.implementation = implementation
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Returns an instance of the implementation, constructing it if
+        necessary.
+
+        :rtype: extendy.Extension
+        """
+
+        raise NotImplementedError()
+
+    def acquire(self):
+        """
+        Returns an instance of the implementation for the caller to use until
+        it passes the instance to ``release()``.
+
+        :rtype: extendy.Extension
+        """
+
+        return self.get()
+
+    def release(self, instance):
+        """
+        Returns an instance retrieved by ``acquire()`` to the scope.
+
+        :param instance: the instance to return
+        :type instance: extendy.Extension
+        """
+
+    def invoke(self, method, args, kwargs):
+        """
+        Invokes the named method on an instance acquired from this scope.
+
+        :param method: the name of the method
+        :type method: str
+        :param args: the positional arguments to pass to the method
+        :type args: tuple
+        :param kwargs: the keyword arguments to pass to the method
+        :type kwargs: dict
+        """
+
+        instance = self.acquire()
+        try:
+            return getattr(instance, method)(*args, **kwargs)
+        finally:
+            self.release(instance)
+
+    def bind(self, method, weak=False):
+        """
+        Returns a callable that invokes the named method on an instance
+        acquired from this scope.
+
+        :param method: the name of the method
+        :type method: str
+        :param weak:
+            whether or not the callable should only hold a weak reference to
+            this scope (and its instances); once the scope is gone, the
+            callable does nothing and returns ``None``
+        :type weak: bool
+        :rtype: callable
+        """
+
+        if weak:
+            scope = weakref.ref(self)
+
+            def call(*args, **kwargs):
+                target = scope()
+                if target is None:
+                    return None
+                return target.invoke(method, args, kwargs)
+
+            return call
+
+        invoke = self.invoke
+        return lambda *args, **kwargs: invoke(method, args, kwargs)
+
+    def close(self):
+        """
+        Closes all the instances that this scope has constructed.
+        """
+
+        with self._lock:
+            instances = self._release()
+        for instance in instances:
+            close_instance(instance)
+
+    def _release(self):
+        raise NotImplementedError()
+
+
+class SingletonScope(Scope):
+    def __init__(self, implementation):
+        super(SingletonScope, self).__init__(implementation)
+        self._instance = None
+
+    def get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self.implementation()
+        return self._instance
+
+    def bind(self, method, weak=False):
+        if weak:
+            return super(SingletonScope, self).bind(method, weak=True)
+        return getattr(self.get(), method)
+
+    def _release(self):
+        instances = [] if self._instance is None else [self._instance]
+        self._instance = None
+        return instances
+
+
+class ThreadInstance(object):
+    """
+    Holds a thread's instance in its thread-local storage, which is discarded
+    when the thread exits.
+    """
+
+    __slots__ = ('instance', '__weakref__')
+
+    def __init__(self, instance):
+        self.instance = instance
+
+
+class ThreadScope(Scope):
+    def __init__(self, implementation):
+        super(ThreadScope, self).__init__(implementation)
+        self._local = threading.local()
+        self._instances = {}
+
+    def get(self):
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = ThreadInstance(self.implementation())
+            self._local.holder = holder
+            # Keyed by a weak reference to the thread-local holder, so that
+            # the instance is closed and dropped when the thread exits, even
+            # if something still refers to the thread.
+            with self._lock:
+                self._instances[weakref.ref(holder, self._thread_exited)] = \
+                    holder.instance
+        return holder.instance
+
+    def _thread_exited(self, holder):
+        # This can be triggered by _release() while the lock is held.
+        instance = self._instances.pop(holder, None)
+        if instance is not None:
+            close_instance(instance)
+
+    def _release(self):
+        instances = list(self._instances.values())
+        self._instances = {}
+        self._local = threading.local()
+        return instances
+
+
+class PoolScope(Scope):
+    def __init__(self, implementation, size):
+        super(PoolScope, self).__init__(implementation)
+        if size < 1:
+            raise ExtendyError(
+                'The instance pool size for "%s.%s" must be at least 1' % (
+                    implementation.__module__,
+                    implementation.__name__,
+                ),
+            )
+        self.size = size
+        self._available = threading.Condition(self._lock)
+        self._idle = []
+        self._created = 0
+        self._closed = False
+
+    def get(self):
+        raise ExtendyError(
+            'Instances of "%s.%s" are pooled and must be checked out' % (
+                self.implementation.__module__,
+                self.implementation.__name__,
+            ),
+        )
+
+    def acquire(self):
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        try:
+            return self.implementation()
+        except BaseException:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    def release(self, instance):
+        with self._available:
+            if not self._closed:
+                self._idle.append(instance)
+                self._available.notify()
+                return
+            self._created -= 1
+            self._available.notify()
+        close_instance(instance)
+
+    def _release(self):
+        instances = self._idle
+        self._idle = []
+        self._created -= len(instances)
+        self._closed = True
+        self._available.notify_all()
+        return instances
+
+
+def create_scope(implementation):
+    """
+    Creates the Scope declared by an implementation's ``instance_scope``
+    property.
+
+    :param implementation: the implementation to create the scope for
+    :type implementation: extendy.Extension
+    :rtype: extendy.instance.Scope
+    """
+
+    scope = getattr(implementation, 'instance_scope', SINGLETON)
+
+    if scope == SINGLETON:
+        return SingletonScope(implementation)
+    if scope == THREAD:
+        return ThreadScope(implementation)
+    if scope == POOL:
+        return PoolScope(
+            implementation,
+            getattr(implementation, 'instance_pool_size', 4),
+        )
+
+    raise ExtendyError(
+        '"%s" is not a valid instance scope (expected one of: %s)' % (
+            scope,
+            ', '.join(SCOPES),
+        ),
+    )
+
@@ -1,16 +1,46 @@
 
 import os
+import threading
+import weakref
 
-from collections import defaultdict
-from pkgutil import iter_modules
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import partial
+from itertools import count
 from warnings import warn
 
-import pkg_resources
-
-from six import string_types, iteritems
-from six.moves.collections_abc import Iterable
+try:
+    from collections.abc import Iterable
+except ImportError:  # pragma: no cover
+    from collections import Iterable
 
+from .dispatch import DispatchPlan, SEQUENTIAL, THREADED
 from .error import ExtendyError, ExtendyWarning
+from .instance import POOL, create_scope
+from .source import (
+    RegistrationSource,
+    EntryPointSource,
+    PathSource,
+    ModuleSource,
+    ModulePrefixSource,
+    NameSource,
+)
+
+
+#: The file extensions of archives that find_by_path() will search.
+ARCHIVE_EXTENSIONS = (
+    '.zip',
+    '.whl',
+)
+
+
+try:
+    string_types = (basestring,)  # noqa: undefined-variable
+except NameError:
+    string_types = (str,)
+
+
+MANAGER_IDS = count()
 
 
 def listify(value):
@@ -31,8 +61,44 @@ class Manager(object):
     retrieval of Extension Implementations.
     """
 
-    def __init__(self):
-        self._registrations = defaultdict(set)
+    def __init__(self, dispatch_threads=None, weak_registrations=False):
+        """
+        :param dispatch_threads:
+            the number of threads to use when dispatching calls in
+            ``threaded`` mode; if not specified, defaults to the number of
+            CPUs
+        :type dispatch_threads: int
+        :param weak_registrations:
+            whether or not to hold only weak references to registered
+            implementations (and the instances constructed for them), so that
+            they are automatically unregistered when nothing else refers to
+            them; if not specified, defaults to ``False``
+        :type weak_registrations: bool
+        """
+
+        self._weak = weak_registrations
+        self._registrations = defaultdict(
+            weakref.WeakSet if weak_registrations else set
+        )
+        self._references = set()
+        self._archives = {}
+        self._scopes = {}
+        self._weak_scopes = weakref.WeakSet()
+        self._scope_attribute = '_extendy_scope_%d' % (next(MANAGER_IDS),)
+        self._plans = {}
+        self._generation = 0
+        self._pool = None
+        self._dispatch_threads = dispatch_threads
+        self._lock = threading.RLock()
+
+        #: Counts of the work done by this manager; ``entry_points_loaded``
+        #: and ``entry_points_skipped`` record how many entry points were
+        #: imported or excluded by a filter before being imported.
+        self.stats = Counter()
+
+        #: Additional ``extendy.Source`` objects that every call to ``find()``
+        #: will search.
+        self.sources = []
 
     def register(self, extension, implementation):
         """
@@ -52,7 +118,15 @@ class Manager(object):
                     fqn(extension),
                 ),
             )
-        self._registrations[extension].add(implementation)
+        with self._lock:
+            registrations = self._registrations[extension]
+            if self._weak and implementation not in registrations:
+                self._references.add((extension, weakref.ref(
+                    implementation,
+                    partial(self._purge, extension),
+                )))
+            registrations.add(implementation)
+            self._invalidate(extension)
 
     def unregister(self, extension, implementation):
         """
@@ -65,12 +139,177 @@ class Manager(object):
         :type implementation: extendy.Extension
         """
 
+        scope = None
+        with self._lock:
+            try:
+                self._registrations[extension].remove(implementation)
+            except KeyError:
+                pass
+            else:
+                if self._weak:
+                    self._references.discard(
+                        (extension, weakref.ref(implementation)),
+                    )
+                self._invalidate(extension)
+                if not self._is_registered(implementation):
+                    scope = self._pop_scope(implementation)
+        if scope is not None:
+            scope.close()
+
+    def get_instance(self, extension, implementation):
+        """
+        Returns a shared instance of an implementation of an extension.
+
+        Instances are constructed lazily, and are shared according to the
+        ``instance_scope`` declared by the implementation: ``singleton`` shares
+        one instance with all callers, and ``thread`` constructs one instance
+        per thread. Implementations with the ``pool`` scope cannot be shared
+        this way; use ``checkout()`` instead.
+
+        :param extension: the extension the implementation is for
+        :type extension: extendy.Extension
+        :param implementation: the implementation to retrieve an instance of
+        :type implementation: extendy.Extension
+        :rtype: extendy.Extension
+        """
+
+        if not self._is_ok(extension, implementation, quiet=True):
+            raise ExtendyError(
+                '"%s" is not inherited from "%s"' % (
+                    fqn(implementation),
+                    fqn(extension),
+                ),
+            )
+        return self._get_scope(implementation).get()
+
+    @contextmanager
+    def checkout(self, extension, implementation):
+        """
+        A context manager that provides an instance of an implementation of
+        an extension for the exclusive use of the caller, if the
+        implementation's ``instance_scope`` is ``pool``.
+
+        Pools hold at most ``instance_pool_size`` instances; when they are all
+        checked out, this waits until one is returned. For other scopes, this
+        provides the same instance as ``get_instance()``.
+
+        :param extension: the extension the implementation is for
+        :type extension: extendy.Extension
+        :param implementation: the implementation to check out an instance of
+        :type implementation: extendy.Extension
+        """
+
+        if not self._is_ok(extension, implementation, quiet=True):
+            raise ExtendyError(
+                '"%s" is not inherited from "%s"' % (
+                    fqn(implementation),
+                    fqn(extension),
+                ),
+            )
+        scope = self._get_scope(implementation)
+        instance = scope.acquire()
         try:
-            self._registrations[extension].remove(implementation)
-        except KeyError:
-            pass
+            yield instance
+        finally:
+            scope.release(instance)
+
+    def instances(self, extension):
+        """
+        Returns shared instances of the implementations of an extension that
+        were registered with this manager. Pooled implementations are skipped;
+        their instances must be retrieved with ``checkout()`` instead.
+
+        :param extension: the extension to retrieve instances for
+        :type extension: extendy.Extension
+        :rtype: list(extendy.Extension)
+        """
+
+        return [
+            self._get_scope(implementation).get()
+            for implementation in sorted(
+                self.find_by_registration(extension),
+                key=fqn,
+            )
+            if getattr(implementation, 'instance_scope', None) != POOL
+        ]
 
-    def find(
+    def close(self):
+        """
+        Tears down all instances of implementations that were constructed by
+        this manager, calling the ``close()`` method of each instance that has
+        one, closes any archives opened by ``find_by_path()`` and any of the
+        manager's ``sources`` that have a ``close()`` method, and stops the
+        thread pool used for dispatching.
+
+        The manager remains usable; instances will be reconstructed and
+        archives reopened as they are needed.
+        """
+
+        with self._lock:
+            scopes = list(self._scopes.values())
+            self._scopes.clear()
+            for scope in list(self._weak_scopes):
+                self._pop_scope(scope.implementation)
+                scopes.append(scope)
+            self._plans.clear()
+            self._generation += 1
+            archives = list(self._archives.values())
+            self._archives.clear()
+            pool, self._pool = self._pool, None
+
+        for scope in scopes:
+            scope.close()
+        for archive in archives:
+            archive.close()
+        for source in self.sources:
+            closer = getattr(source, 'close', None)
+            if callable(closer):
+                closer()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def dispatch(
+            self,
+            extension,
+            method,
+            args=None,
+            kwargs=None,
+            mode=SEQUENTIAL):
+        """
+        Calls a method on every implementation of an extension that was
+        registered with this manager.
+
+        Implementations are instantiated via ``get_instance()``, and the bound
+        methods are compiled into a plan that is reused until the
+        registrations for the extension change.
+
+        :param extension: the extension whose implementations to call
+        :type extension: extendy.Extension
+        :param method: the name of the method to call
+        :type method: str
+        :param args: the positional arguments to pass to the method
+        :type args: tuple
+        :param kwargs: the keyword arguments to pass to the method
+        :type kwargs: dict
+        :param mode:
+            how to call the implementations; ``sequential`` calls each in
+            turn and returns ``None``, ``first`` returns the first result that
+            is not ``None``, ``collect`` returns a list of all results, and
+            ``threaded`` calls them concurrently and returns a list of all
+            results; if not specified, defaults to ``sequential``
+        :type mode: str
+        """
+
+        plan = self._plans.get((extension, method))
+        if plan is None:
+            plan = self._get_plan(extension, method)
+
+        pool = self._get_pool() if mode == THREADED else None
+
+        return plan(args or (), kwargs or {}, mode=mode, pool=pool)
+
+    def find(  # noqa: too-many-arguments
             self,
             extension,
             registered=True,
@@ -78,11 +317,17 @@ class Manager(object):
             paths=None,
             prefixes=None,
             modules=None,
-            names=None):
+            names=None,
+            entry_point_filter=None,
+            extra_sources=None):
         """
         Returns implementations of the specified extension that are found in
         any number of locations.
 
+        Each kind of location is searched by a built-in ``extendy.Source``;
+        any other sources in the manager's ``sources`` or in ``extra_sources``
+        are searched as well.
+
         :param extension: the extension to retrieve implementations for
         :type extension: extendy.Extension
         :param registered:
@@ -103,38 +348,40 @@ class Manager(object):
         :type modules: list(str or module)
         :param names: the full-qualified names of implementations to include
         :type names: list(str)
+        :param entry_point_filter:
+            the filter to apply to the metadata of entry points before they
+            are loaded
+        :type entry_point_filter: extendy.EntryPointFilter
+        :param extra_sources:
+            additional sources to search for implementations, beyond those in
+            the manager's ``sources``
+        :type extra_sources: list(extendy.Source)
         :rtype: list(extendy.Extension)
         """
 
-        implementations = set()
+        sources = []
 
         if registered:
-            implementations.update(self.find_by_registration(extension))
-
-        for entry_point in listify(entry_points):
-            implementations.update(
-                self.find_by_entry_point(extension, entry_point)
-            )
-
-        for path in listify(paths):
-            implementations.update(
-                self.find_by_path(extension, path)
-            )
-
-        for module in listify(modules):
-            implementations.update(
-                self.find_by_module(extension, module)
-            )
-
-        for prefix in listify(prefixes):
-            implementations.update(
-                self.find_by_module_prefix(extension, prefix)
-            )
+            sources.append(RegistrationSource())
+
+        sources.extend(
+            EntryPointSource(entry_point, entry_point_filter)
+            for entry_point in listify(entry_points)
+        )
+        sources.extend(PathSource(path) for path in listify(paths))
+        sources.extend(ModuleSource(module) for module in listify(modules))
+        sources.extend(
+            ModulePrefixSource(prefix)
+            for prefix in listify(prefixes)
+        )
+        sources.extend(NameSource(name) for name in listify(names))
+
+        sources.extend(self.sources)
+        sources.extend(listify(extra_sources))
 
-        for name in listify(names):
-            implementations.add(
-                self.find_by_name(extension, name)
-            )
+        implementations = set()
+        for source in sources:
+            implementations.update(source.find(self, extension))
 
         return list(implementations)
 
@@ -150,7 +397,11 @@ class Manager(object):
 
         return list(self._registrations[extension])
 
-    def find_by_entry_point(self, extension, entry_point):
+    def find_by_entry_point(
+            self,
+            extension,
+            entry_point,
+            entry_point_filter=None):
         """
         Returns implementations of an extension that are installed via the
         specified ``setuptools`` entry_point.
@@ -159,12 +410,25 @@ class Manager(object):
         :type extension: extendy.Extension
         :param entry_point: the name of the entry_point to search
         :type entry_point: str
+        :param entry_point_filter:
+            the filter to apply to the metadata of each entry point before it
+            is loaded; any callable that accepts a
+            ``pkg_resources.EntryPoint`` and returns whether or not to load it
+            can be used
+        :type entry_point_filter: extendy.EntryPointFilter
         :rtype: list(extendy.Extension)
         """
 
+        import pkg_resources
+
         implementations = []
 
         for entry in pkg_resources.iter_entry_points(entry_point):
+            if entry_point_filter and not entry_point_filter(entry):
+                self.stats['entry_points_skipped'] += 1
+                continue
+
+            self.stats['entry_points_loaded'] += 1
             try:
                 implementation = entry.load()
             except ImportError as exc:
@@ -188,11 +452,15 @@ class Manager(object):
     def find_by_path(self, extension, path):
         """
         Returns implementations of an extension that are found in modules found
-        in the specified directory.
+        in the specified directory, or in the specified ``.zip`` or ``.whl``
+        archive.
+
+        Archives are kept open by the manager and their contents are indexed
+        once, until they change or the manager is closed.
 
         :param extension: the extension to retrieve implementations for
         :type extension: extendy.Extension
-        :param path: the directory to search
+        :param path: the directory or archive to search
         :type path: str or module
         :rtype: list(extendy.Extension)
         """
@@ -202,9 +470,20 @@ class Manager(object):
         if path.endswith('/'):
             path = path[:-1]
 
+        if path.endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path):
+            archive = self._get_archive(path)
+            if archive is None:
+                return implementations
+            for name in archive.iter_modules():
+                module = archive.load_module(name)
+                implementations.extend(self.find_by_module(extension, module))
+            return implementations
+
         if not os.path.exists(path):
             return implementations
 
+        from pkgutil import iter_modules
+
         for importer, name, _ in iter_modules([path]):
             module = importer.find_module(name).load_module(name)
             implementations.extend(self.find_by_module(extension, module))
@@ -223,6 +502,8 @@ class Manager(object):
         :rtype: list(extendy.Extension)
         """
 
+        from pkgutil import iter_modules
+
         implementations = []
 
         for _, name, _ in iter_modules():
@@ -259,8 +540,8 @@ class Manager(object):
 
         implementations = []
 
-        for name, obj in iteritems(module.__dict__):
-            if name.startswith('_'):
+        for name, obj in list(module.__dict__.items()):
+            if name.startswith('_') or not isinstance(obj, type):
                 continue
             if self._is_ok(extension, obj, quiet=True):
                 implementations.append(obj)
@@ -280,6 +561,13 @@ class Manager(object):
         :rtype: extendy.Extension
         """
 
+        if '.' not in name:
+            warn(
+                '"%s" is not a fully-qualified class name' % (name,),
+                ExtendyWarning,
+            )
+            return None
+
         module_name, class_name = name.rsplit('.', 1)
         try:
             module = __import__(module_name, globals(), locals(), class_name)
@@ -303,11 +591,145 @@ class Manager(object):
                     ExtendyWarning,
                 )
             else:
-                if self._is_ok(extension, implementation):
+                if not isinstance(implementation, type):
+                    warn('"%s" is not a class' % (name,), ExtendyWarning)
+                elif self._is_ok(extension, implementation):
                     return implementation
 
         return None
 
+    def _get_plan(self, extension, method):
+        if not hasattr(extension, method):
+            raise ExtendyError(
+                '"%s" has no method named "%s"' % (
+                    fqn(extension),
+                    method,
+                ),
+            )
+
+        while True:
+            with self._lock:
+                plan = self._plans.get((extension, method))
+                if plan is not None:
+                    return plan
+                generation = self._generation
+                implementations = sorted(
+                    self._registrations[extension],
+                    key=fqn,
+                )
+
+            # Constructing the instances can be expensive, so it's done
+            # without holding the lock; if the registrations changed in the
+            # meantime, the plan is stale and has to be built again.
+            callables = [
+                self._get_scope(implementation).bind(method, weak=self._weak)
+                for implementation in implementations
+            ]
+
+            with self._lock:
+                if self._generation == generation:
+                    plan = DispatchPlan(callables)
+                    self._plans[(extension, method)] = plan
+                    return plan
+
+                # Anything unregistered while the plan was being built may
+                # have had its scope (re)created above; evict it again.
+                scopes = [
+                    self._pop_scope(implementation)
+                    for implementation in implementations
+                    if not self._is_registered(implementation)
+                ]
+            for scope in scopes:
+                if scope is not None:
+                    scope.close()
+
+    def _is_registered(self, implementation):
+        return any(
+            implementation in implementations
+            for implementations in self._registrations.values()
+        )
+
+    def _get_scope(self, implementation):
+        scope = self._find_scope(implementation)
+        if scope is None:
+            with self._lock:
+                scope = self._find_scope(implementation)
+                if scope is None:
+                    scope = create_scope(implementation)
+                    if self._weak:
+                        # Kept on the implementation rather than the manager,
+                        # so that the implementation, its scope, and its
+                        # instances form a cycle that can be collected.
+                        setattr(implementation, self._scope_attribute, scope)
+                        self._weak_scopes.add(scope)
+                    else:
+                        self._scopes[implementation] = scope
+        return scope
+
+    def _find_scope(self, implementation):
+        if self._weak:
+            return vars(implementation).get(self._scope_attribute)
+        return self._scopes.get(implementation)
+
+    def _pop_scope(self, implementation):
+        if not self._weak:
+            return self._scopes.pop(implementation, None)
+        scope = vars(implementation).get(self._scope_attribute)
+        if scope is not None:
+            delattr(implementation, self._scope_attribute)
+            self._weak_scopes.discard(scope)
+        return scope
+
+    def _get_archive(self, path):
+        import zipfile
+
+        from .archive import Archive
+
+        path = os.path.abspath(path)
+
+        with self._lock:
+            archive = self._archives.get(path)
+            if archive is not None and archive.is_stale():
+                del self._archives[path]
+                archive.close()
+                archive = None
+
+            if archive is None:
+                if not os.path.isfile(path):
+                    return None
+                try:
+                    archive = Archive(path)
+                except (zipfile.BadZipfile, EnvironmentError) as exc:
+                    warn(
+                        'Could not open archive "%s": %s' % (
+                            path,
+                            exc,
+                        ),
+                        ExtendyWarning,
+                    )
+                    return None
+                self._archives[path] = archive
+
+            return archive
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    from multiprocessing.pool import ThreadPool
+                    self._pool = ThreadPool(self._dispatch_threads)
+        return self._pool
+
+    def _purge(self, extension, reference):
+        with self._lock:
+            self._references.discard((extension, reference))
+            self._invalidate(extension)
+
+    def _invalidate(self, extension):
+        self._generation += 1
+        for key in [key for key in self._plans if key[0] is extension]:
+            del self._plans[key]
+
     def _is_ok(self, extension, implementation, quiet=False):  # noqa: no-self-use
         if not issubclass(implementation, extension):
             if not quiet:
@@ -0,0 +1,469 @@
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from warnings import warn
+
+from .error import ExtendyError, ExtendyWarning
+
+
+#: The loader classes whose ``exec_module()`` is timed by the ImportTracker.
+LOADERS = (
+    ('importlib.machinery', 'SourceFileLoader'),
+    ('importlib.machinery', 'SourcelessFileLoader'),
+    ('importlib.machinery', 'ExtensionFileLoader'),
+    ('zipimport', 'zipimporter'),
+    ('extendy.archive', 'Archive'),
+)
+
+SORT_KEYS = (
+    'time',
+    'memory',
+    'imports',
+    'name',
+)
+
+clock = getattr(time, 'perf_counter', time.time)
+
+
+def check_supported():
+    # Python 2 imports modules without going through loaders' exec_module(),
+    # so there is nothing for the ImportTracker to hook.
+    if sys.version_info < (3, 4):
+        raise ExtendyError('Profiling imports requires Python 3.4 or later')
+
+
+def get_tracemalloc():
+    # tracemalloc only exists on CPython; other interpreters either lack it
+    # or don't report allocations meaningfully.
+    if platform.python_implementation() != 'CPython':
+        return None
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    return tracemalloc
+
+
+def load_class(name):
+    module_name, class_name = name.rsplit('.', 1)
+    module = __import__(module_name, globals(), locals(), class_name)
+    try:
+        return getattr(module, class_name)
+    except AttributeError:
+        raise ExtendyError(
+            'Could not find class "%s" in module "%s"' % (
+                class_name,
+                module_name,
+            ),
+        )
+
+
+class ImportTracker(object):
+    """
+    Records the time spent and memory allocated while executing each module
+    that is imported while the tracker is installed, along with which module
+    caused it to be imported.
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.modules = {}
+        self._stack = []
+        self._originals = []
+
+    def install(self):
+        if self.memory:
+            tracemalloc = get_tracemalloc()
+            if tracemalloc is None:
+                warn(
+                    'tracemalloc is not available on this interpreter, so'
+                    ' memory allocations will not be measured',
+                    ExtendyWarning,
+                )
+                self.memory = False
+            elif not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+        for module_name, class_name in LOADERS:
+            try:
+                loader = getattr(
+                    __import__(module_name, globals(), locals(), class_name),
+                    class_name,
+                )
+            except (ImportError, AttributeError):
+                continue
+            original = getattr(loader, 'exec_module', None)
+            if original is None:
+                continue
+            self._originals.append((loader, original))
+            loader.exec_module = self._wrap(original)
+
+    def uninstall(self):
+        for loader, original in reversed(self._originals):
+            loader.exec_module = original
+        self._originals = []
+
+        if self.memory:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def _wrap(self, original):
+        tracker = self
+
+        def exec_module(loader, module):
+            tracker.enter(module.__name__)
+            try:
+                return original(loader, module)
+            finally:
+                tracker.exit()
+
+        return exec_module
+
+    def _get_memory(self):
+        if not self.memory:
+            return 0
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[0]
+
+    def enter(self, name):
+        record = {
+            'name': name,
+            'parent': self._stack[-1]['name'] if self._stack else None,
+            'children': [],
+            'time': 0.0,
+            'memory': 0,
+        }
+        if self._stack:
+            self._stack[-1]['children'].append(name)
+        self.modules[name] = record
+        self._stack.append(record)
+        record['_start'] = (clock(), self._get_memory())
+
+    def exit(self):
+        record = self._stack.pop()
+        start_time, start_memory = record.pop('_start')
+        record['time'] = clock() - start_time
+        record['memory'] = max(self._get_memory() - start_memory, 0)
+
+    def descendants(self, name):
+        """
+        Returns the names of the modules that were first imported while the
+        specified module was being executed.
+
+        :param name: the name of the module
+        :type name: str
+        :rtype: list(str)
+        """
+
+        found = []
+        pending = list(self.modules[name]['children'])
+        while pending:
+            child = pending.pop()
+            found.append(child)
+            pending.extend(self.modules[child]['children'])
+        return found
+
+
+def profile(config):
+    """
+    Runs ``Manager.find()`` in the current interpreter and returns a report
+    of the import cost of each implementation that was found.
+
+    :param config:
+        the ``extension`` to find implementations of, the ``entry_points``,
+        ``paths``, ``modules``, ``prefixes``, and ``names`` to pass to
+        ``find()``, and whether or not to measure ``memory``
+    :type config: dict
+    :rtype: dict
+    """
+
+    from .manager import Manager
+
+    check_supported()
+    extension = load_class(config['extension'])
+    tracker = ImportTracker(memory=config.get('memory', True))
+
+    # Manager (and pkgutil) import their discovery machinery on first use;
+    # get that out of the way so only the costs of the implementations are
+    # measured.
+    import inspect
+    import pkgutil
+    import zipfile
+    from . import archive
+    if config.get('entry_points'):
+        import pkg_resources
+
+    tracker.install()
+    try:
+        start = clock()
+        implementations = Manager().find(
+            extension,
+            registered=False,
+            entry_points=config.get('entry_points'),
+            paths=config.get('paths'),
+            modules=config.get('modules'),
+            prefixes=config.get('prefixes'),
+            names=config.get('names'),
+        )
+        elapsed = clock() - start
+    finally:
+        tracker.uninstall()
+
+    results = []
+    for implementation in implementations:
+        if implementation is None:
+            continue
+        module = implementation.__module__
+        record = tracker.modules.get(module)
+        imports = [module] + tracker.descendants(module) if record else []
+        results.append({
+            'name': '%s.%s' % (module, implementation.__name__),
+            'module': module,
+            'time': record['time'] if record else 0.0,
+            'memory': record['memory'] if record else 0,
+            'imports': imports,
+        })
+
+    return {
+        'extension': config['extension'],
+        'time': elapsed,
+        'memory': sum(
+            record['memory']
+            for record in tracker.modules.values()
+            if record['parent'] is None
+        ),
+        'imports': sorted(tracker.modules),
+        'implementations': results,
+    }
+
+
+def run(config):
+    """
+    Profiles ``Manager.find()`` in a fresh Python interpreter.
+
+    :param config: the configuration to pass to ``profile()``
+    :type config: dict
+    :rtype: dict
+    """
+
+    check_supported()
+    handle, output = tempfile.mkstemp(suffix='.json', prefix='extendy-')
+    os.close(handle)
+    try:
+        status = subprocess.call([
+            sys.executable,
+            '-m',
+            'extendy.profiler',
+            json.dumps(config),
+            output,
+        ])
+        if status != 0:
+            raise ExtendyError(
+                'Profiling "%s" failed with exit status %s' % (
+                    config['extension'],
+                    status,
+                ),
+            )
+        with open(output, 'r') as results:
+            return json.load(results)
+    finally:
+        os.remove(output)
+
+
+def format_report(report, sort='time'):
+    """
+    Formats the results of ``profile()`` as a human-readable table.
+
+    :param report: the results of ``profile()``
+    :type report: dict
+    :param sort:
+        the column to sort the implementations by; one of ``time``,
+        ``memory``, ``imports``, or ``name``
+    :type sort: str
+    :rtype: str
+    """
+
+    if sort == 'imports':
+        key = lambda result: len(result['imports'])
+    else:
+        key = lambda result: result[sort]
+    implementations = sorted(
+        report['implementations'],
+        key=key,
+        reverse=sort != 'name',
+    )
+
+    width = max(
+        [len('Implementation')]
+        + [len(result['name']) for result in implementations]
+    )
+    row = '%%-%ds  %%10s  %%12s  %%7s' % (width,)
+
+    lines = [row % ('Implementation', 'Time (ms)', 'Memory (KiB)', 'Imports')]
+    for result in implementations:
+        lines.append(row % (
+            result['name'],
+            '%.1f' % (result['time'] * 1000,),
+            '%.1f' % (result['memory'] / 1024.0,),
+            len(result['imports']),
+        ))
+    lines.append('')
+    lines.append(
+        'find() of %s took %.1f ms, allocated %.1f KiB, and imported %d'
+        ' modules' % (
+            report['extension'],
+            report['time'] * 1000,
+            report['memory'] / 1024.0,
+            len(report['imports']),
+        ),
+    )
+
+    return '\n'.join(lines)
+
+
+def check_budgets(report, max_time=None, max_memory=None):
+    """
+    Returns descriptions of the implementations whose import cost exceeds
+    the specified budgets.
+
+    :param report: the results of ``profile()``
+    :type report: dict
+    :param max_time: the maximum import time, in milliseconds
+    :type max_time: float
+    :param max_memory: the maximum allocated memory, in KiB
+    :type max_memory: float
+    :rtype: list(str)
+    """
+
+    problems = []
+
+    for result in report['implementations']:
+        if max_time is not None and result['time'] * 1000 > max_time:
+            problems.append('%s took %.1f ms to import (budget: %s ms)' % (
+                result['name'],
+                result['time'] * 1000,
+                max_time,
+            ))
+        if max_memory is not None and result['memory'] / 1024.0 > max_memory:
+            problems.append(
+                '%s allocated %.1f KiB on import (budget: %s KiB)' % (
+                    result['name'],
+                    result['memory'] / 1024.0,
+                    max_memory,
+                ),
+            )
+
+    return problems
+
+
+def configure_parser(parser):
+    parser.add_argument(
+        'extension',
+        help='the fully-qualified name of the Extension to find',
+    )
+    parser.add_argument(
+        '-e', '--entry-point',
+        dest='entry_points',
+        action='append',
+        help='an entry point group to search',
+    )
+    parser.add_argument(
+        '-p', '--path',
+        dest='paths',
+        action='append',
+        help='a directory to search',
+    )
+    parser.add_argument(
+        '-m', '--module',
+        dest='modules',
+        action='append',
+        help='a module to search',
+    )
+    parser.add_argument(
+        '-x', '--prefix',
+        dest='prefixes',
+        action='append',
+        help='a prefix of module names to search',
+    )
+    parser.add_argument(
+        '-n', '--name',
+        dest='names',
+        action='append',
+        help='the fully-qualified name of an implementation to include',
+    )
+    parser.add_argument(
+        '--no-memory',
+        dest='memory',
+        action='store_false',
+        help='do not trace memory allocations (which slows down imports)',
+    )
+    parser.add_argument(
+        '--sort',
+        choices=SORT_KEYS,
+        default='time',
+        help='the column to sort the report by',
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='output the report as JSON',
+    )
+    parser.add_argument(
+        '--max-time',
+        type=float,
+        help='fail if an implementation takes longer than this many'
+        ' milliseconds to import',
+    )
+    parser.add_argument(
+        '--max-memory',
+        type=float,
+        help='fail if an implementation allocates more than this many KiB'
+        ' when imported',
+    )
+    parser.set_defaults(handler=handle)
+
+
+def handle(args):
+    report = run({
+        'extension': args.extension,
+        'entry_points': args.entry_points,
+        'paths': args.paths,
+        'modules': args.modules,
+        'prefixes': args.prefixes,
+        'names': args.names,
+        'memory': args.memory,
+    })
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        print(format_report(report, sort=args.sort))
+
+    problems = check_budgets(
+        report,
+        max_time=args.max_time,
+        max_memory=args.max_memory,
+    )
+    for problem in problems:
+        sys.stderr.write('Over budget: %s\n' % (problem,))
+
+    return 1 if problems else 0
+
+
+def main(argv=None):
+    config, output = (argv or sys.argv[1:])[:2]
+    report = profile(json.loads(config))
+    with open(output, 'w') as results:
+        json.dump(report, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
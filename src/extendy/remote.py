@@ -0,0 +1,249 @@
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from warnings import warn
+
+from .error import ExtendyWarning
+from .manager import fqn, string_types
+from .source import Source
+
+
+def check_listing(listing):
+    """
+    Raises a ValueError if a registry listing is not an object that maps the
+    names of Extensions to lists of the names of their implementations.
+
+    :param listing: the decoded listing
+    :type listing: dict
+    """
+
+    if not isinstance(listing, dict):
+        raise ValueError('listing is not an object')
+    for extension, names in listing.items():
+        if not isinstance(names, list) or not all(
+                isinstance(name, string_types)
+                for name in names):
+            raise ValueError(
+                'implementations of "%s" are not a list of names' % (
+                    extension,
+                ),
+            )
+
+
+class HttpRegistrySource(Source):
+    """
+    Finds implementations using a listing fetched from a remote plugin
+    registry.
+
+    The registry is expected to respond with a JSON object that maps the
+    fully-qualified names of Extensions to lists of the fully-qualified names
+    of their implementations. The listing is fetched over a single keep-alive
+    connection and revalidated with ``If-None-Match`` on each search, so an
+    unchanged listing costs one round-trip and no download.
+    """
+
+    def __init__(
+            self,
+            url,
+            cache_path=None,
+            max_age=0,
+            timeout=10,
+            retry_delay=30):
+        """
+        :param url: the URL of the registry listing
+        :type url: str
+        :param cache_path:
+            the file to store the listing and its ``ETag`` in, so that other
+            processes can revalidate it instead of downloading it again
+        :type cache_path: str
+        :param max_age:
+            the number of seconds to reuse a fetched listing for without
+            revalidating it with the registry; if not specified, defaults to
+            ``0``
+        :type max_age: float
+        :param timeout:
+            the number of seconds to wait on the registry before giving up;
+            if not specified, defaults to ``10``
+        :type timeout: float
+        :param retry_delay:
+            the number of seconds to wait after failing to fetch the listing
+            before contacting the registry again; if not specified, defaults
+            to ``30``
+        :type retry_delay: float
+        """
+
+        from six.moves.urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        self.url = url
+        self.cache_path = cache_path
+        self.max_age = max_age
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._target = parts.path or '/'
+        if parts.query:
+            self._target += '?' + parts.query
+
+        self._connection = None
+        self._listing = None
+        self._etag = None
+        self._fetched = None
+        self._failed = None
+        self._lock = threading.Lock()
+
+    def find(self, manager, extension):
+        implementations = []
+
+        for name in self.fetch().get(fqn(extension), []):
+            implementation = manager.find_by_name(extension, name)
+            if implementation is not None:
+                implementations.append(implementation)
+
+        return implementations
+
+    def fetch(self):
+        """
+        Returns the registry's listing, revalidating or retrieving it from
+        the registry as necessary.
+
+        If the registry cannot be reached or responds with an invalid listing,
+        the last known good listing is returned, and the registry is not
+        contacted again until ``retry_delay`` has passed.
+
+        :rtype: dict
+        """
+
+        with self._lock:
+            if self._listing is None and self.cache_path:
+                self._load_cache()
+
+            if self._fetched is not None \
+                    and time.time() - self._fetched < self.max_age:
+                return self._listing
+            if self._failed is not None \
+                    and time.time() - self._failed < self.retry_delay:
+                return self._listing or {}
+
+            headers = {'Accept': 'application/json'}
+            if self._etag and self._listing is not None:
+                headers['If-None-Match'] = self._etag
+
+            from six.moves import http_client
+
+            try:
+                status, etag, body = self._request(headers)
+                if status == 200:
+                    listing = json.loads(body.decode('utf-8'))
+                    check_listing(listing)
+                    self._listing = listing
+                    self._etag = etag
+                elif status != 304 or self._listing is None:
+                    # A 304 is only meaningful if there's a listing that it
+                    # says is still current.
+                    raise ValueError('HTTP status %s' % (status,))
+            except (
+                    ValueError,
+                    EnvironmentError,
+                    http_client.HTTPException) as exc:
+                self._failed = time.time()
+                warn(
+                    'Could not fetch registry "%s": %s' % (
+                        self.url,
+                        exc,
+                    ),
+                    ExtendyWarning,
+                )
+                return self._listing or {}
+
+            if status == 200 and self.cache_path:
+                self._save_cache()
+
+            self._fetched = time.time()
+            self._failed = None
+            return self._listing
+
+    def close(self):
+        """
+        Closes the connection to the registry.
+        """
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self):
+        from six.moves import http_client
+
+        if self._scheme == 'https':
+            return http_client.HTTPSConnection(
+                self._netloc,
+                timeout=self.timeout,
+            )
+        return http_client.HTTPConnection(self._netloc, timeout=self.timeout)
+
+    def _request(self, headers):
+        from six.moves import http_client
+
+        while True:
+            reused = self._connection is not None
+            if not reused:
+                self._connection = self._connect()
+            try:
+                self._connection.request('GET', self._target, headers=headers)
+                response = self._connection.getresponse()
+                body = response.read()
+            except (http_client.HTTPException, EnvironmentError):
+                self._connection.close()
+                self._connection = None
+                if not reused:
+                    raise
+                # The server may have closed an idle keep-alive connection, so
+                # reconnect and try once more.
+                continue
+
+            if response.getheader('Connection', '').lower() == 'close':
+                self._connection.close()
+                self._connection = None
+
+            return response.status, response.getheader('ETag'), body
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as cache:
+                cached = json.load(cache)
+            check_listing(cached.get('listing'))
+        except (AttributeError, ValueError, EnvironmentError):
+            return
+        self._listing = cached['listing']
+        self._etag = cached.get('etag')
+
+    def _save_cache(self):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        path = None
+        try:
+            handle, path = tempfile.mkstemp(dir=directory, prefix='.extendy-')
+            with os.fdopen(handle, 'w') as cache:
+                json.dump(
+                    {'etag': self._etag, 'listing': self._listing},
+                    cache,
+                )
+            getattr(os, 'replace', os.rename)(path, self.cache_path)
+        except EnvironmentError as exc:
+            warn(
+                'Could not write registry cache "%s": %s' % (
+                    self.cache_path,
+                    exc,
+                ),
+                ExtendyWarning,
+            )
+            if path and os.path.exists(path):
+                os.remove(path)
+
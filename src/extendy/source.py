@@ -0,0 +1,96 @@
+
+
+class Source(object):
+    """
+    The base class for locations that ``extendy.Manager.find()`` can search
+    for the implementations of an Extension.
+    """
+
+    def find(self, manager, extension):
+        """
+        Returns the implementations of an extension that are found in this
+        source.
+
+        :param manager: the manager that is performing the search
+        :type manager: extendy.Manager
+        :param extension: the extension to retrieve implementations for
+        :type extension: extendy.Extension
+        :rtype: list(extendy.Extension)
+        """
+
+        raise NotImplementedError()
+
+
+class RegistrationSource(Source):
+    """
+    Finds the implementations that were registered with the manager.
+    """
+
+    def find(self, manager, extension):
+        return manager.find_by_registration(extension)
+
+
+class EntryPointSource(Source):
+    """
+    Finds the implementations installed via a ``setuptools`` entry point.
+    """
+
+    def __init__(self, entry_point, entry_point_filter=None):
+        self.entry_point = entry_point
+        self.entry_point_filter = entry_point_filter
+
+    def find(self, manager, extension):
+        return manager.find_by_entry_point(
+            extension,
+            self.entry_point,
+            entry_point_filter=self.entry_point_filter,
+        )
+
+
+class PathSource(Source):
+    """
+    Finds the implementations in the modules in a directory or archive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def find(self, manager, extension):
+        return manager.find_by_path(extension, self.path)
+
+
+class ModuleSource(Source):
+    """
+    Finds the implementations in a module.
+    """
+
+    def __init__(self, module):
+        self.module = module
+
+    def find(self, manager, extension):
+        return manager.find_by_module(extension, self.module)
+
+
+class ModulePrefixSource(Source):
+    """
+    Finds the implementations in the modules whose names have a prefix.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def find(self, manager, extension):
+        return manager.find_by_module_prefix(extension, self.prefix)
+
+
+class NameSource(Source):
+    """
+    Finds an implementation by its fully-qualified name.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def find(self, manager, extension):
+        return [manager.find_by_name(extension, self.name)]
+
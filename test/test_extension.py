@@ -77,3 +77,26 @@ def test_register():
 
     assert man.find(TestExtension) == [TestImplementation]
 
+
+
+def test_dispatch():
+    man = Manager()
+    calls = []
+
+    class TestExtension(Extension):
+        manager = man
+
+        def hook(self, value):
+            pass
+
+    class TestImplementation(TestExtension):
+        def hook(self, value):
+            calls.append(value)
+
+    TestExtension.dispatch('hook', 1)
+    assert calls == []
+
+    TestExtension.register(TestImplementation)
+    TestExtension.dispatch('hook', 1)
+    TestExtension.dispatch('hook', value=2)
+    assert calls == [1, 2]
@@ -0,0 +1,92 @@
+import pkg_resources
+
+import pytest
+
+import extendy_testpkg
+
+from extendy import EntryPointFilter, Manager, ExtendyWarning
+
+
+def make_entry(definition, project_name='some-plugin', version='1.2.0'):
+    return pkg_resources.EntryPoint.parse(
+        definition,
+        dist=pkg_resources.Distribution(
+            project_name=project_name,
+            version=version,
+        ),
+    )
+
+
+def test_empty():
+    assert EntryPointFilter()(make_entry('foo = some.module:Foo'))
+
+
+def test_names():
+    entry_filter = EntryPointFilter(names=['foo*', 'bar'])
+
+    assert entry_filter(make_entry('foo = some.module:Foo'))
+    assert entry_filter(make_entry('foobar = some.module:Foo'))
+    assert entry_filter(make_entry('bar = some.module:Foo'))
+    assert not entry_filter(make_entry('barbar = some.module:Foo'))
+    assert not entry_filter(make_entry('Foo = some.module:Foo'))
+
+
+def test_distributions():
+    entry_filter = EntryPointFilter(distributions='Some_Plugin')
+
+    assert entry_filter(make_entry('foo = some.module:Foo'))
+    assert not entry_filter(make_entry('foo = some.module:Foo', project_name='other'))
+
+    entry_filter = EntryPointFilter(exclude_distributions=['some_plugin'])
+
+    assert not entry_filter(make_entry('foo = some.module:Foo'))
+    assert entry_filter(make_entry('foo = some.module:Foo', project_name='other'))
+
+
+def test_requirements():
+    entry_filter = EntryPointFilter(requirements=['some-plugin>=1.2,<2'])
+
+    assert entry_filter(make_entry('foo = some.module:Foo'))
+    assert not entry_filter(make_entry('foo = some.module:Foo', version='1.1'))
+    assert not entry_filter(make_entry('foo = some.module:Foo', version='2.0'))
+    assert entry_filter(make_entry('foo = some.module:Foo', project_name='other', version='0.1'))
+
+
+def test_extras():
+    entry_filter = EntryPointFilter(extras=['fast', 'safe'])
+
+    assert entry_filter(make_entry('foo = some.module:Foo [fast]'))
+    assert entry_filter(make_entry('foo = some.module:Foo [safe,other]'))
+    assert not entry_filter(make_entry('foo = some.module:Foo [other]'))
+    assert not entry_filter(make_entry('foo = some.module:Foo'))
+
+
+def test_manager():
+    man = Manager()
+
+    actual = man.find_by_entry_point(
+        extendy_testpkg.FooExtension,
+        'extendytest',
+        entry_point_filter=EntryPointFilter(names='foo'),
+    )
+    assert actual == [extendy_testpkg.ThirdFooImplementation]
+    assert man.stats['entry_points_loaded'] == 1
+    assert man.stats['entry_points_skipped'] == 2
+
+    actual = man.find(
+        extendy_testpkg.FooExtension,
+        entry_points='extendytest',
+        entry_point_filter=EntryPointFilter(exclude_distributions='extendy_testpkg'),
+    )
+    assert actual == []
+    assert man.stats['entry_points_loaded'] == 1
+    assert man.stats['entry_points_skipped'] == 5
+
+    with pytest.warns(ExtendyWarning, match='Could not load entry'):
+        actual = man.find(
+            extendy_testpkg.FooExtension,
+            entry_points='extendytest',
+            entry_point_filter=EntryPointFilter(requirements='extendy_testpkg==0.0.0'),
+        )
+    assert actual == [extendy_testpkg.ThirdFooImplementation]
+    assert man.stats['entry_points_loaded'] == 4
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+
+#: The longest that importing extendy may take in a fresh interpreter.
+MAX_IMPORT_TIME = 0.05
+
+SCRIPT = '''
+import json, sys, time
+start = time.time()
+import extendy
+elapsed = time.time() - start
+json.dump({'time': elapsed, 'modules': sorted(sys.modules)}, sys.stdout)
+'''
+
+
+def import_extendy():
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT])
+    return json.loads(output.decode('utf-8'))
+
+
+def test_import_is_lazy():
+    result = import_extendy()
+
+    for module in (
+            'pkg_resources',
+            'pkgutil',
+            'six',
+            'zipfile',
+            'extendy.archive',
+            'extendy.profiler'):
+        assert module not in result['modules']
+
+
+def test_import_time():
+    elapsed = min(import_extendy()['time'] for _ in range(3))
+
+    assert elapsed < MAX_IMPORT_TIME
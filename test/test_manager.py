@@ -88,6 +88,12 @@ def test_by_name():
     with pytest.warns(ExtendyWarning, match='Could not find class'):
         assert man.find_by_name(extendy_testpkg.FooExtension, 'extendy_testpkg.DoesNotExist') is None
 
+    with pytest.warns(ExtendyWarning, match='not a fully-qualified class name'):
+        assert man.find_by_name(extendy_testpkg.FooExtension, 'NoDots') is None
+
+    with pytest.warns(ExtendyWarning, match='is not a class'):
+        assert man.find_by_name(extendy_testpkg.FooExtension, 'os.sep') is None
+
 
 def list_classes(classes):
     return sorted([
@@ -242,3 +248,525 @@ def test_find():
         'test.test_manager.RegisteredFoo',
     ]
 
+
+
+class HookExtension(Extension):
+    def hook(self, value):
+        pass
+
+class FirstHook(HookExtension):
+    created = 0
+
+    def __init__(self):
+        FirstHook.created += 1
+
+    def hook(self, value):
+        return None
+
+class SecondHook(HookExtension):
+    def hook(self, value):
+        return value * 2
+
+
+def test_dispatch():
+    man = Manager()
+
+    assert man.dispatch(HookExtension, 'hook', (1,)) is None
+    assert man.dispatch(HookExtension, 'hook', (1,), mode='collect') == []
+
+    FirstHook.created = 0
+    man.register(HookExtension, FirstHook)
+    man.register(HookExtension, SecondHook)
+
+    assert man.dispatch(HookExtension, 'hook', (2,)) is None
+    assert man.dispatch(HookExtension, 'hook', (2,), mode='first') == 4
+    assert man.dispatch(HookExtension, 'hook', kwargs={'value': 3}, mode='collect') == [None, 6]
+    assert man.dispatch(HookExtension, 'hook', (4,), mode='threaded') == [None, 8]
+    assert FirstHook.created == 1
+
+    man.unregister(HookExtension, SecondHook)
+    assert man.dispatch(HookExtension, 'hook', (2,), mode='collect') == [None]
+    assert man.dispatch(HookExtension, 'hook', (2,), mode='first') is None
+    assert FirstHook.created == 1
+
+
+def test_dispatch_bad():
+    man = Manager()
+    man.register(HookExtension, SecondHook)
+
+    with pytest.raises(ExtendyError, match='has no method'):
+        man.dispatch(HookExtension, 'missing')
+
+    with pytest.raises(ExtendyError, match='not a valid dispatch mode'):
+        man.dispatch(HookExtension, 'hook', (1,), mode='garbage')
+
+
+class ResourceExtension(Extension):
+    pass
+
+class SingletonResource(ResourceExtension):
+    closed = 0
+
+    def close(self):
+        SingletonResource.closed += 1
+
+class ThreadResource(ResourceExtension):
+    instance_scope = 'thread'
+
+class PoolResource(ResourceExtension):
+    instance_scope = 'pool'
+    instance_pool_size = 2
+
+class BadScopeResource(ResourceExtension):
+    instance_scope = 'garbage'
+
+
+def test_get_instance():
+    man = Manager()
+
+    instance = man.get_instance(ResourceExtension, SingletonResource)
+    assert isinstance(instance, SingletonResource)
+    assert man.get_instance(ResourceExtension, SingletonResource) is instance
+
+    with pytest.raises(ExtendyError, match='not inherited from'):
+        man.get_instance(ResourceExtension, OtherImplementation)
+
+    with pytest.raises(ExtendyError, match='not a valid instance scope'):
+        man.get_instance(ResourceExtension, BadScopeResource)
+
+
+def test_get_instance_thread():
+    import threading
+
+    man = Manager()
+
+    instance = man.get_instance(ResourceExtension, ThreadResource)
+    assert man.get_instance(ResourceExtension, ThreadResource) is instance
+
+    others = []
+    thread = threading.Thread(
+        target=lambda: others.append(man.get_instance(ResourceExtension, ThreadResource)),
+    )
+    thread.start()
+    thread.join()
+    assert others[0] is not instance
+    assert isinstance(others[0], ThreadResource)
+
+
+def test_checkout_pool():
+    import threading
+
+    man = Manager()
+
+    with pytest.raises(ExtendyError, match='must be checked out'):
+        man.get_instance(ResourceExtension, PoolResource)
+
+    with man.checkout(ResourceExtension, PoolResource) as first:
+        with man.checkout(ResourceExtension, PoolResource) as second:
+            assert first is not second
+            assert isinstance(second, PoolResource)
+
+            checked_out = []
+            thread = threading.Thread(target=lambda: checked_out.append(
+                man.checkout(ResourceExtension, PoolResource).__enter__()
+            ))
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+            assert checked_out == []
+
+        thread.join(5)
+        assert checked_out == [second]
+
+    with man.checkout(ResourceExtension, PoolResource) as third:
+        assert third is first
+
+    with man.checkout(ResourceExtension, SingletonResource) as instance:
+        assert instance is man.get_instance(ResourceExtension, SingletonResource)
+
+
+def test_dispatch_pool():
+    import threading
+    import time
+
+    man = Manager(dispatch_threads=4)
+    active = []
+    overlapped = []
+
+    class PooledHook(HookExtension):
+        instance_scope = 'pool'
+        instance_pool_size = 1
+
+        def hook(self, value):
+            if active:
+                overlapped.append(value)
+            active.append(self)
+            time.sleep(0.01)
+            active.remove(self)
+            return value
+
+    man.register(HookExtension, PooledHook)
+
+    threads = [
+        threading.Thread(target=man.dispatch, args=(HookExtension, 'hook', (value,)))
+        for value in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert overlapped == []
+    assert man.dispatch(HookExtension, 'hook', (5,), mode='collect') == [5]
+
+
+def test_instances():
+    man = Manager()
+
+    assert man.instances(ResourceExtension) == []
+
+    man.register(ResourceExtension, SingletonResource)
+    man.register(ResourceExtension, ThreadResource)
+    man.register(ResourceExtension, PoolResource)
+
+    instances = man.instances(ResourceExtension)
+    assert [type(instance) for instance in instances] == [SingletonResource, ThreadResource]
+    assert man.instances(ResourceExtension) == instances
+
+
+def test_close():
+    man = Manager()
+    SingletonResource.closed = 0
+
+    man.register(ResourceExtension, SingletonResource)
+    instance = man.get_instance(ResourceExtension, SingletonResource)
+
+    man.close()
+    assert SingletonResource.closed == 1
+    assert man.get_instance(ResourceExtension, SingletonResource) is not instance
+
+    man.unregister(ResourceExtension, SingletonResource)
+    assert SingletonResource.closed == 2
+
+    man.close()
+    assert SingletonResource.closed == 2
+
+
+def test_weak_registrations():
+    import gc
+
+    man = Manager(weak_registrations=True)
+
+    class Generated(HookExtension):
+        def hook(self, value):
+            return value
+
+    man.register(HookExtension, Generated)
+    man.register(HookExtension, SecondHook)
+    assert sorted(man.find_by_registration(HookExtension), key=lambda cls: cls.__name__) == [
+        Generated,
+        SecondHook,
+    ]
+
+    del Generated
+    gc.collect()
+
+    assert man.find_by_registration(HookExtension) == [SecondHook]
+    assert man.dispatch(HookExtension, 'hook', (1,), mode='collect') == [2]
+    assert len(man._references) == 1
+
+    man.unregister(HookExtension, SecondHook)
+    assert man.find_by_registration(HookExtension) == []
+    assert len(man._references) == 0
+
+
+def test_weak_registrations_dispatch():
+    import gc
+
+    man = Manager(weak_registrations=True)
+
+    class Generated(HookExtension):
+        def hook(self, value):
+            return value
+
+    man.register(HookExtension, Generated)
+    assert man.dispatch(HookExtension, 'hook', (1,), mode='collect') == [1]
+
+    man.close()
+    del Generated
+    gc.collect()
+
+    assert man.dispatch(HookExtension, 'hook', (1,), mode='collect') == []
+
+
+def make_archive(path, members):
+    import zipfile
+
+    with zipfile.ZipFile(str(path), 'w') as archive:
+        for name, source in members.items():
+            archive.writestr(name, source)
+    return str(path)
+
+
+STUFF_SOURCE = 'from extendy_testpkg import FooExtension\n\nclass %s(FooExtension):\n    pass\n'
+
+
+def test_by_path_archive(tmpdir):
+    man = Manager()
+
+    path = make_archive(tmpdir.join('stuff.zip'), {
+        'zipfoo.py': STUFF_SOURCE % 'ZipFoo',
+        'zipbar/__init__.py': STUFF_SOURCE % 'ZipBar',
+        'zipbar/ignored.py': STUFF_SOURCE % 'Ignored',
+        'not-a-module.py': STUFF_SOURCE % 'Ignored',
+        'README.txt': 'hello',
+    })
+
+    actual = man.find_by_path(extendy_testpkg.FooExtension, path)
+    assert list_classes(actual) == ['zipbar.ZipBar', 'zipfoo.ZipFoo']
+
+    archive = man._archives[path]
+    actual = man.find_by_path(extendy_testpkg.FooExtension, path)
+    assert list_classes(actual) == ['zipbar.ZipBar', 'zipfoo.ZipFoo']
+    assert man._archives[path] is archive
+
+    import sys
+    assert sys.modules['zipbar'].__path__ == [os.path.join(path, 'zipbar')]
+    assert 'class ZipFoo' in sys.modules['zipfoo'].__loader__.get_source('zipfoo')
+
+    man.close()
+    assert man._archives == {}
+
+
+def test_by_path_wheel(tmpdir):
+    man = Manager()
+
+    path = make_archive(tmpdir.join('plugin-1.0-py3-none-any.whl'), {
+        'wheelfoo/__init__.py': STUFF_SOURCE % 'WheelFoo',
+        'plugin-1.0.dist-info/METADATA': 'Name: plugin\n',
+    })
+
+    actual = man.find_by_path(extendy_testpkg.FooExtension, path)
+    assert list_classes(actual) == ['wheelfoo.WheelFoo']
+
+    man.close()
+
+
+def test_by_path_archive_changed(tmpdir):
+    man = Manager()
+
+    path = make_archive(tmpdir.join('changing.zip'), {
+        'changefoo.py': STUFF_SOURCE % 'ChangeFoo',
+    })
+    actual = man.find_by_path(extendy_testpkg.FooExtension, path)
+    assert list_classes(actual) == ['changefoo.ChangeFoo']
+
+    make_archive(tmpdir.join('changing.zip'), {
+        'changefoo.py': STUFF_SOURCE % 'ChangeFoo',
+        'changebar.py': STUFF_SOURCE % 'ChangeBar',
+    })
+    os.utime(path, (0, 0))
+    actual = man.find_by_path(extendy_testpkg.FooExtension, path)
+    assert list_classes(actual) == ['changebar.ChangeBar', 'changefoo.ChangeFoo']
+
+    man.close()
+
+
+def test_by_path_archive_bad(tmpdir):
+    man = Manager()
+
+    assert man.find_by_path(extendy_testpkg.FooExtension, '/some/bogus/archive.zip') == []
+
+    path = tmpdir.join('garbage.zip')
+    path.write('this is not a zip file')
+    with pytest.warns(ExtendyWarning, match='Could not open archive'):
+        assert man.find_by_path(extendy_testpkg.FooExtension, str(path)) == []
+
+
+def test_by_path_directory_named_like_archive(tmpdir):
+    directory = tmpdir.mkdir('plugins.zip')
+    directory.join('zipdirfoo.py').write(STUFF_SOURCE % 'ZipDirFoo')
+
+    man = Manager()
+    actual = man.find_by_path(extendy_testpkg.FooExtension, str(directory))
+    assert [clazz.__name__ for clazz in actual] == ['ZipDirFoo']
+    assert man._archives == {}
+
+
+def test_dispatch_builds_plan_without_lock():
+    import threading
+
+    man = Manager()
+    started = threading.Event()
+    proceed = threading.Event()
+
+    class SlowHook(HookExtension):
+        def __init__(self):
+            started.set()
+            assert proceed.wait(5)
+
+        def hook(self, value):
+            return 'slow'
+
+    man.register(HookExtension, SlowHook)
+
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(man.dispatch(HookExtension, 'hook', (1,), mode='collect')),
+    )
+    thread.start()
+    assert started.wait(5)
+
+    # The constructor is still running, but the manager isn't locked.
+    man.register(HookExtension, SecondHook)
+    assert man.dispatch(OtherExtension, 'mro') is None
+
+    proceed.set()
+    thread.join(5)
+    assert results == [[2, 'slow']]
+
+
+def test_dispatch_unregister_while_building_plan():
+    import threading
+
+    man = Manager()
+    started = threading.Event()
+    proceed = threading.Event()
+
+    class SlowHook(HookExtension):
+        def __init__(self):
+            started.set()
+            assert proceed.wait(5)
+
+        def hook(self, value):
+            return 'slow'
+
+    class ZClosingHook(HookExtension):
+        closed = 0
+
+        def hook(self, value):
+            return 'closing'
+
+        def close(self):
+            ZClosingHook.closed += 1
+
+    man.register(HookExtension, SlowHook)
+    man.register(HookExtension, ZClosingHook)
+
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(man.dispatch(HookExtension, 'hook', (1,), mode='collect')),
+    )
+    thread.start()
+    assert started.wait(5)
+
+    # The plan is being built from a snapshot that still includes
+    # ZClosingHook, so its instance gets constructed after it's unregistered.
+    man.unregister(HookExtension, ZClosingHook)
+    proceed.set()
+    thread.join(5)
+
+    assert results == [['slow']]
+    assert ZClosingHook not in man._scopes
+    assert ZClosingHook.closed == 1
+    man.close()
+    assert ZClosingHook.closed == 1
+
+
+def test_get_instance_thread_exited():
+    import threading
+    import time
+
+    from six.moves import _thread
+
+    man = Manager()
+
+    class ClosingThreadResource(ResourceExtension):
+        instance_scope = 'thread'
+        closed = 0
+
+        def close(self):
+            ClosingThreadResource.closed += 1
+
+    instance = man.get_instance(ResourceExtension, ClosingThreadResource)
+
+    # The finished Thread objects are kept around on purpose.
+    threads = []
+    for _ in range(3):
+        thread = threading.Thread(
+            target=man.get_instance,
+            args=(ResourceExtension, ClosingThreadResource),
+        )
+        thread.start()
+        thread.join()
+        threads.append(thread)
+
+    # Threads not started through threading are only known to it via
+    # dummy Thread objects that are never cleaned up.
+    def work():
+        threading.current_thread()
+        man.get_instance(ResourceExtension, ClosingThreadResource)
+
+    for _ in range(3):
+        _thread.start_new_thread(work, ())
+
+    deadline = time.time() + 5
+    while ClosingThreadResource.closed < 6 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert ClosingThreadResource.closed == 6
+    assert list(man._scopes[ClosingThreadResource]._instances.values()) == [instance]
+
+    man.close()
+    assert ClosingThreadResource.closed == 7
+
+
+def test_weak_registrations_instances():
+    import gc
+
+    man = Manager(weak_registrations=True)
+
+    def generate(index, scope):
+        class Generated(HookExtension):
+            instance_scope = scope
+
+            def hook(self, value):
+                return index
+
+        Generated.__name__ = 'Generated%02d' % (index,)
+        return Generated
+
+    generated = []
+    for index, scope in enumerate(['singleton', 'thread', 'pool'] * 10):
+        implementation = generate(index, scope)
+        man.register(HookExtension, implementation)
+        assert man.dispatch(HookExtension, 'hook', (1,), mode='collect')[-1] == index
+        if scope != 'pool':
+            assert man.get_instance(HookExtension, implementation).hook(1) == index
+        generated.append(implementation)
+    assert len(man._weak_scopes) == 30
+
+    del generated, implementation
+    gc.collect()
+
+    assert man.find_by_registration(HookExtension) == []
+    assert len(man._weak_scopes) == 0
+    assert man.dispatch(HookExtension, 'hook', (1,), mode='collect') == []
+
+
+def test_weak_registrations_close():
+    man = Manager(weak_registrations=True)
+    SingletonResource.closed = 0
+
+    man.register(ResourceExtension, SingletonResource)
+    instance = man.get_instance(ResourceExtension, SingletonResource)
+    assert man.get_instance(ResourceExtension, SingletonResource) is instance
+
+    man.close()
+    assert SingletonResource.closed == 1
+    assert not any(name.startswith('_extendy_scope_') for name in vars(SingletonResource))
+
+    man.get_instance(ResourceExtension, SingletonResource)
+    man.unregister(ResourceExtension, SingletonResource)
+    assert SingletonResource.closed == 2
+    assert len(man._weak_scopes) == 0
@@ -0,0 +1,153 @@
+import json
+import os
+import sys
+
+import pytest
+
+from extendy import ExtendyWarning
+from extendy.__main__ import main
+from extendy.profiler import ImportTracker, format_report, check_budgets, get_tracemalloc
+
+
+STUFF = os.path.join(os.path.dirname(__file__), 'testpkg/src/extendy_testpkg/stuff/')
+
+requires_hooks = pytest.mark.skipif(
+    sys.version_info < (3, 4),
+    reason='profiling imports requires Python 3.4 or later',
+)
+
+
+@requires_hooks
+def test_profile_json(capsys):
+    assert main([
+        'profile',
+        'extendy_testpkg.FooExtension',
+        '--path', STUFF,
+        '--name', 'extendy_testpkg.FooImplementation',
+        '--json',
+    ]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report['extension'] == 'extendy_testpkg.FooExtension'
+    assert sorted(report['imports']) == ['bar', 'baz', 'foo']
+    assert sorted([result['name'] for result in report['implementations']]) == [
+        'bar.StuffBar',
+        'baz.StuffBaz',
+        'extendy_testpkg.FooImplementation',
+        'foo.StuffFoo',
+    ]
+    for result in report['implementations']:
+        if result['module'] == 'extendy_testpkg':
+            assert result['imports'] == []
+        else:
+            assert result['imports'] == [result['module']]
+            assert result['time'] > 0
+            if get_tracemalloc() is not None:
+                assert result['memory'] > 0
+
+
+@requires_hooks
+def test_profile_budget(capsys):
+    assert main([
+        'profile',
+        'extendy_testpkg.FooExtension',
+        '--path', STUFF,
+        '--no-memory',
+        '--max-time', '0',
+    ]) == 1
+
+    captured = capsys.readouterr()
+    assert 'foo.StuffFoo' in captured.out
+    assert captured.err.count('Over budget:') == 3
+
+
+@requires_hooks
+def test_profile_archive(tmpdir, capsys):
+    import zipfile
+
+    path = str(tmpdir.join('slow.zip'))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr(
+            'zipslow/__init__.py',
+            'import time\n'
+            'time.sleep(0.05)\n'
+            'from . import helper\n'
+            'from extendy_testpkg import FooExtension\n'
+            '\n'
+            'class ZipSlow(FooExtension):\n'
+            '    pass\n',
+        )
+        archive.writestr('zipslow/helper.py', 'VALUE = 1\n')
+
+    assert main([
+        'profile',
+        'extendy_testpkg.FooExtension',
+        '--path', path,
+        '--no-memory',
+        '--max-time', '40',
+        '--json',
+    ]) == 1
+
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert {'zipslow', 'zipslow.helper'} <= set(report['imports'])
+    result, = report['implementations']
+    assert result['name'] == 'zipslow.ZipSlow'
+    assert result['time'] >= 0.05
+    assert result['imports'][0] == 'zipslow'
+    assert 'zipslow.helper' in result['imports']
+    assert 'zipslow.ZipSlow took' in captured.err
+
+
+@requires_hooks
+def test_profile_bad(capsys):
+    assert main(['profile', 'extendy_testpkg.DoesNotExist']) == 1
+    assert 'failed with exit status' in capsys.readouterr().err
+
+
+def test_profile_unsupported(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'version_info', (2, 7, 18))
+    assert main(['profile', 'extendy_testpkg.FooExtension', '--path', STUFF]) == 1
+    assert 'requires Python 3.4 or later' in capsys.readouterr().err
+
+
+def test_tracker_without_tracemalloc(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'tracemalloc', None)
+
+    tracker = ImportTracker()
+    with pytest.warns(ExtendyWarning, match='tracemalloc is not available'):
+        tracker.install()
+    try:
+        assert tracker.memory is False
+        tracker.enter('example')
+        tracker.exit()
+    finally:
+        tracker.uninstall()
+    assert tracker.modules['example']['memory'] == 0
+
+
+def test_format_report():
+    report = {
+        'extension': 'some.Extension',
+        'time': 0.5,
+        'memory': 4096,
+        'imports': ['a', 'b', 'c'],
+        'implementations': [
+            {'name': 'a.Fast', 'module': 'a', 'time': 0.1, 'memory': 2048, 'imports': ['a']},
+            {'name': 'b.Slow', 'module': 'b', 'time': 0.4, 'memory': 1024, 'imports': ['b', 'c']},
+        ],
+    }
+
+    lines = format_report(report).splitlines()
+    assert lines[1].startswith('b.Slow')
+    assert lines[2].startswith('a.Fast')
+    assert lines[-1] == 'find() of some.Extension took 500.0 ms, allocated 4.0 KiB, and imported 3 modules'
+
+    lines = format_report(report, sort='memory').splitlines()
+    assert lines[1].startswith('a.Fast')
+
+    assert check_budgets(report) == []
+    assert check_budgets(report, max_time=200, max_memory=1.5) == [
+        'a.Fast allocated 2.0 KiB on import (budget: 1.5 KiB)',
+        'b.Slow took 400.0 ms to import (budget: 200 ms)',
+    ]
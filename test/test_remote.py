@@ -0,0 +1,267 @@
+import json
+import threading
+
+import pytest
+
+import extendy_testpkg
+
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from extendy import Manager, ExtendyWarning
+from extendy.remote import HttpRegistrySource
+
+
+class Registry(object):
+    def __init__(self):
+        self.listing = {
+            'extendy_testpkg.FooExtension': [
+                'extendy_testpkg.FooImplementation',
+                'extendy_testpkg.AnotherFooImplementation',
+            ],
+        }
+        self.version = 1
+        self.status = None
+        self.drop = False
+        self.garbage = False
+        self.connections = 0
+        self.requests = []
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                BaseHTTPRequestHandler.setup(self)
+                registry.connections += 1
+
+            def do_GET(self):
+                registry.requests.append((self.path, self.headers.get('If-None-Match')))
+                etag = '"v%d"' % (registry.version,)
+
+                if registry.drop:
+                    self.close_connection = True
+                elif registry.garbage:
+                    self.wfile.write(b'garbage\r\n\r\n')
+                    self.close_connection = True
+                elif registry.status:
+                    self.send_response(registry.status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                elif self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                else:
+                    body = json.dumps(registry.listing).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:%d/plugins.json' % (self.server.server_address[1],)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def registry():
+    registry = Registry()
+    yield registry
+    registry.stop()
+
+
+def names(classes):
+    return sorted(clazz.__name__ for clazz in classes)
+
+
+def test_find(registry):
+    man = Manager()
+    source = HttpRegistrySource(registry.url)
+    man.sources.append(source)
+
+    expected = ['AnotherFooImplementation', 'FooImplementation']
+    assert names(man.find(extendy_testpkg.FooExtension)) == expected
+    assert names(man.find(extendy_testpkg.FooExtension)) == expected
+    assert man.find(extendy_testpkg.BarExtension) == []
+
+    assert registry.requests == [
+        ('/plugins.json', None),
+        ('/plugins.json', '"v1"'),
+        ('/plugins.json', '"v1"'),
+    ]
+    assert registry.connections == 1
+
+    registry.listing = {
+        'extendy_testpkg.FooExtension': ['extendy_testpkg.ThirdFooImplementation'],
+    }
+    registry.version = 2
+    assert names(man.find(extendy_testpkg.FooExtension)) == ['ThirdFooImplementation']
+    assert registry.requests[-1] == ('/plugins.json', '"v1"')
+
+    man.close()
+    assert names(man.find(extendy_testpkg.FooExtension)) == ['ThirdFooImplementation']
+    assert registry.requests[-1] == ('/plugins.json', '"v2"')
+    assert registry.connections == 2
+    man.close()
+
+
+def test_max_age(registry):
+    source = HttpRegistrySource(registry.url, max_age=60)
+
+    assert source.fetch() == registry.listing
+    assert source.fetch() == registry.listing
+    assert len(registry.requests) == 1
+    source.close()
+
+
+def test_cache(registry, tmpdir):
+    cache_path = str(tmpdir.join('registry.json'))
+
+    source = HttpRegistrySource(registry.url, cache_path=cache_path)
+    assert source.fetch() == registry.listing
+    source.close()
+
+    source = HttpRegistrySource(registry.url, cache_path=cache_path)
+    assert source.fetch() == registry.listing
+    source.close()
+
+    assert registry.requests == [
+        ('/plugins.json', None),
+        ('/plugins.json', '"v1"'),
+    ]
+
+
+def test_unavailable(registry):
+    source = HttpRegistrySource(registry.url)
+    listing = source.fetch()
+
+    registry.status = 500
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == listing
+    source.close()
+
+    registry.stop()
+    source = HttpRegistrySource(registry.url, timeout=1)
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == {}
+
+
+
+def test_bad_entries(registry):
+    registry.listing = {
+        'extendy_testpkg.FooExtension': [
+            'NoDots',
+            'extendy_testpkg.FooImplementation',
+            'os.sep',
+            'extendy_testpkg.AnotherFooImplementation',
+        ],
+    }
+    man = Manager()
+    source = HttpRegistrySource(registry.url)
+
+    with pytest.warns(ExtendyWarning) as record:
+        actual = man.find(extendy_testpkg.FooExtension, extra_sources=[source])
+    assert names(actual) == ['AnotherFooImplementation', 'FooImplementation']
+    assert sorted(str(warning.message) for warning in record if warning.category is ExtendyWarning) == [
+        '"NoDots" is not a fully-qualified class name',
+        '"os.sep" is not a class',
+    ]
+    source.close()
+
+def test_bad_response(registry):
+    man = Manager()
+
+    registry.garbage = True
+    source = HttpRegistrySource(registry.url)
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert man.find(extendy_testpkg.FooExtension, extra_sources=[source]) == []
+    source.close()
+
+    # A 304 is meaningless without a listing to revalidate.
+    registry.garbage = False
+    registry.status = 304
+    source = HttpRegistrySource(registry.url)
+    with pytest.warns(ExtendyWarning, match='HTTP status 304'):
+        assert man.find(extendy_testpkg.FooExtension, extra_sources=[source]) == []
+    source.close()
+
+    source = HttpRegistrySource('http://127.0.0.1:notaport/plugins.json')
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == {}
+
+
+def test_retry(registry):
+    source = HttpRegistrySource(registry.url, retry_delay=0)
+    listing = source.fetch()
+    assert registry.connections == 1
+
+    # A failure on a reused keep-alive connection is retried once on a new
+    # connection, but a failure on a new connection is not.
+    registry.drop = True
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == listing
+    assert len(registry.requests) == 3
+    assert registry.connections == 2
+
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == listing
+    assert len(registry.requests) == 4
+    assert registry.connections == 3
+    source.close()
+
+
+def test_retry_delay(registry):
+    source = HttpRegistrySource(registry.url, retry_delay=60)
+    listing = source.fetch()
+
+    registry.status = 500
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == listing
+    assert source.fetch() == listing
+    assert len(registry.requests) == 2
+
+    registry.status = None
+    source._failed -= 60
+    assert source.fetch() == listing
+    assert len(registry.requests) == 3
+    assert source._failed is None
+    source.close()
+
+
+@pytest.mark.parametrize('listing', [
+    ['extendy_testpkg.FooImplementation'],
+    {'extendy_testpkg.FooExtension': 'extendy_testpkg.FooImplementation'},
+    {'extendy_testpkg.FooExtension': [1, 2]},
+])
+def test_invalid(registry, tmpdir, listing):
+    cache_path = str(tmpdir.join('registry.json'))
+    source = HttpRegistrySource(registry.url, cache_path=cache_path)
+    good = source.fetch()
+
+    registry.listing = listing
+    registry.version = 2
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == good
+    assert registry.requests[-1] == ('/plugins.json', '"v1"')
+    assert source._etag == '"v1"'
+    source.close()
+
+    with open(cache_path, 'w') as cache:
+        json.dump({'etag': '"v2"', 'listing': listing}, cache)
+    source = HttpRegistrySource(registry.url, cache_path=cache_path)
+    with pytest.warns(ExtendyWarning, match='Could not fetch registry'):
+        assert source.fetch() == {}
+    assert registry.requests[-1] == ('/plugins.json', None)
+    source.close()
@@ -0,0 +1,88 @@
+import os
+
+import extendy_testpkg
+
+from extendy import (
+    Manager,
+    Source,
+    RegistrationSource,
+    PathSource,
+    ModuleSource,
+    NameSource,
+)
+
+
+class StaticSource(Source):
+    def __init__(self, *implementations):
+        self.implementations = list(implementations)
+        self.searched = []
+        self.closed = False
+
+    def find(self, manager, extension):
+        self.searched.append(extension)
+        return [
+            implementation
+            for implementation in self.implementations
+            if issubclass(implementation, extension)
+        ]
+
+    def close(self):
+        self.closed = True
+
+
+def test_builtin_sources():
+    man = Manager()
+
+    class RegisteredFoo(extendy_testpkg.FooExtension):
+        pass
+    man.register(extendy_testpkg.FooExtension, RegisteredFoo)
+
+    assert RegistrationSource().find(man, extendy_testpkg.FooExtension) == [RegisteredFoo]
+
+    assert sorted(
+        clazz.__name__
+        for clazz in PathSource(
+            os.path.join(os.path.dirname(__file__), 'testpkg/src/extendy_testpkg/stuff/'),
+        ).find(man, extendy_testpkg.FooExtension)
+    ) == ['StuffBar', 'StuffBaz', 'StuffFoo']
+
+    assert len(ModuleSource('extendy_testpkg').find(man, extendy_testpkg.FooExtension)) == 3
+
+    assert NameSource('extendy_testpkg.FooImplementation').find(man, extendy_testpkg.FooExtension) == [
+        extendy_testpkg.FooImplementation,
+    ]
+
+
+def test_extra_sources():
+    man = Manager()
+    source = StaticSource(extendy_testpkg.FooImplementation, extendy_testpkg.BarImplementation)
+
+    assert man.find(extendy_testpkg.FooExtension) == []
+
+    assert man.find(extendy_testpkg.FooExtension, extra_sources=source) == [
+        extendy_testpkg.FooImplementation,
+    ]
+    assert man.find(extendy_testpkg.BarExtension, extra_sources=[source]) == [
+        extendy_testpkg.BarImplementation,
+    ]
+    assert source.searched == [extendy_testpkg.FooExtension, extendy_testpkg.BarExtension]
+
+
+def test_manager_sources():
+    man = Manager()
+    source = StaticSource(extendy_testpkg.FooImplementation)
+    man.sources.append(source)
+
+    assert man.find(extendy_testpkg.FooExtension, registered=False) == [
+        extendy_testpkg.FooImplementation,
+    ]
+    assert sorted(man.find(
+        extendy_testpkg.FooExtension,
+        names='extendy_testpkg.AnotherFooImplementation',
+    ), key=lambda clazz: clazz.__name__) == [
+        extendy_testpkg.AnotherFooImplementation,
+        extendy_testpkg.FooImplementation,
+    ]
+
+    man.close()
+    assert source.closed